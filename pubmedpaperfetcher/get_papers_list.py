@@ -3,8 +3,15 @@ import logging
 import sys
 from .papers_fetcher import fetch_papers, save_to_csv
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+def configure_logging():
+    """
+    Configures console logging for the command-line interface.
+    """
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+    # httpx logs every request URL at INFO, which would expose the NCBI API key
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    logging.getLogger("httpcore").setLevel(logging.WARNING)
 
 def main():
     """
@@ -27,12 +34,19 @@ def main():
         help="Filename to save the output CSV (default: papers.csv)."
     )
 
+    parser.add_argument(
+        "-n", "--max-results", type=int, default=10,
+        help="Maximum number of papers to fetch (default: 10)."
+    )
+
     args = parser.parse_args()
 
-    logging.info(f"🔍 Searching for papers related to: {args.query}")
+    configure_logging()
+
+    logging.info("🔍 Searching for papers related to: %s", args.query)
 
     try:
-        papers = fetch_papers(args.query, debug=args.debug)
+        papers = fetch_papers(args.query, debug=args.debug, max_results=args.max_results)
 
         if not papers:
             logging.warning("⚠ No papers found for the query: %s", args.query)
@@ -1,143 +1,581 @@
+import io
 import os
 import csv
 import re
+import asyncio
+import contextlib
+import functools
 import logging
-import requests
-from typing import List, Tuple, Optional
-from xml.etree import ElementTree as ET
-
-# Setup logging
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+import multiprocessing
+import weakref
+import httpx
+import orjson
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Tuple, Optional, Union
+
+try:
+    from lxml import etree as ET
+    _HAS_LXML = True
+except ImportError:  # Fall back to the slower stdlib parser
+    from xml.etree import ElementTree as ET
+    _HAS_LXML = False
+
+try:
+    import pygixml
+except ImportError:  # Optional pugixml-based parser backend
+    pygixml = None
 
 # Constants
 PUBMED_API_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esearch.fcgi"
 PUBMED_FETCH_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/efetch.fcgi"
 DATA_DIR = "data"
 RETRIES = 3  # Number of retries for API requests
+RETRY_BACKOFF_FACTOR = 0.5  # Seconds; doubled after each failed attempt
+RETRY_MAX_BACKOFF = 60  # Seconds; upper bound on any wait, including a server's Retry-After
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)  # Throttling and transient server errors
+ESEARCH_PAGE_SIZE = 5000  # IDs requested per esearch page
+ESEARCH_MAX_RESULTS = 9999  # PubMed esearch cannot page past this many records
+EFETCH_BATCH_SIZE = 200  # IDs sent per efetch request
+PARSE_WORKERS = os.cpu_count() or 1  # Processes used to parse efetch batches
+PARALLEL_PARSE_MIN_BATCHES = 4  # Below this, process start-up costs more than it saves
+CSV_BATCH_SIZE = 1000  # Rows handed to the CSV writer at a time
+CSV_BUFFER_SIZE = 1 << 20  # Bytes buffered before writing the CSV file
+
+# NCBI etiquette: identify the client; an API key raises the rate limit from 3 to 10 req/s
+NCBI_TOOL = "pubmedpaperfetcher"
+NCBI_EMAIL = os.environ.get("NCBI_EMAIL")
+NCBI_API_KEY = os.environ.get("NCBI_API_KEY")
+MAX_CONCURRENT_REQUESTS = 10 if NCBI_API_KEY else 3  # Requests in flight, sized to the NCBI rate limit
+NCBI_REQUESTS_PER_SECOND = 10 if NCBI_API_KEY else 3  # Request starts allowed per second and client
 
 # Ensure 'data' directory exists
 os.makedirs(DATA_DIR, exist_ok=True)
 
-# Keywords for classification
-ACADEMIC_KEYWORDS = [
+# Keywords for classification (tuples: they are compiled into _AFFILIATION_RE at import)
+ACADEMIC_KEYWORDS = (
     "university", "institute", "college", "academy", "school", "lab",
     "research center", "department", "faculty", "center for", "school of",
     "national laboratory", "polytechnic", "higher education"
-]
+)
 
-NON_ACADEMIC_KEYWORDS = [
+NON_ACADEMIC_KEYWORDS = (
     "pharma", "inc.", "corporation", "private ltd", "hospital", "clinic", "biotech",
     "limited", "ltd.", "corp.", "gmbh", "pvt", "s.a.", "llc", "co.", "foundation",
     "healthcare", "medical center", "biopharma", "research institute", "r&d", "venture"
-]
+)
+
+# Email addresses; the lookbehind anchors matches at the start of the address
+_EMAIL_PATTERN = r"(?<![a-zA-Z0-9._%+-])[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]+"
+
+# One case-insensitive (ASCII) regex sweep over an affiliation. The lookahead reports every keyword
+# start (academic keywords first, so they win when both begin at the same position); the
+# email branch consumes a single character so keywords inside the address are still seen.
+_AFFILIATION_RE = re.compile(
+    r"(?=(?P<acad>" + "|".join(map(re.escape, ACADEMIC_KEYWORDS)) + r")"
+    r"|(?P<nonacad>" + "|".join(map(re.escape, NON_ACADEMIC_KEYWORDS)) + r"))"
+    r"|(?=(?P<email>" + _EMAIL_PATTERN + r")).",
+    re.I | re.A  # ASCII-only case folding: under Unicode, [a-zA-Z] would also match "ı", "ſ", "K"
+)
+
+def _compile_xpath(path: str):
+    """
+    Compiles an element-selecting path once, using lxml's XPath when available.
+
+    Args:
+        path (str): An ElementPath-compatible XPath expression.
+
+    Returns:
+        Callable: Function taking an element and returning the list of matches.
+    """
+    if _HAS_LXML:
+        return ET.XPath(path, smart_strings=False)
+    return lambda element: element.findall(path)
+
+# Precompiled XPath queries used while parsing efetch responses
+_AFFILIATION_XP = _compile_xpath(".//AffiliationInfo/Affiliation")
+
+# Compiled queries for the optional pugixml backend
+if pygixml is not None:
+    _PUGI_ARTICLE_XQ = pygixml.XPathQuery("//PubmedArticle")
+    _PUGI_PMID_XQ = pygixml.XPathQuery(".//PMID")
+    _PUGI_TITLE_XQ = pygixml.XPathQuery(".//ArticleTitle")
+    _PUGI_YEAR_XQ = pygixml.XPathQuery(".//PubDate/Year")
+    _PUGI_AUTHOR_XQ = pygixml.XPathQuery(".//Author")
+    _PUGI_AFFILIATION_XQ = pygixml.XPathQuery(".//AffiliationInfo/Affiliation")
+
+_XML_ENCODING_RE = re.compile(rb"""^\s*<\?xml[^>]*?encoding=["']([A-Za-z0-9._-]+)["']""")
+
+# Elements collected from each article during a single walk of its subtree
+_ARTICLE_FIELD_TAGS = ("PMID", "ArticleTitle", "PubDate", "Author")
 
 class PubMedAPIError(Exception):
     """Custom exception for PubMed API errors."""
     pass
 
-def fetch_papers(query: str, debug: bool = False) -> List[List[str]]:
+class _RateLimiter:
+    """Spaces request starts at least 1/rate seconds apart."""
+
+    def __init__(self, rate: float):
+        self._interval = 1 / rate
+        self._lock = asyncio.Lock()
+        self._next_start = 0.0
+
+    async def wait(self) -> None:
+        """Waits until the next request may start, then reserves the following slot."""
+        async with self._lock:
+            now = asyncio.get_running_loop().time()
+            if self._next_start > now:
+                await asyncio.sleep(self._next_start - now)
+            self._next_start = max(now, self._next_start) + self._interval
+
+# One limiter per client, dropped with it: concurrent fetches each get their own budget
+_RATE_LIMITERS = weakref.WeakKeyDictionary()
+
+def fetch_papers(query: str, debug: bool = False, max_results: int = 10) -> List[List[str]]:
     """
     Fetch papers from PubMed based on the search query.
     
     Args:
         query (str): The search term for PubMed.
         debug (bool): If True, enables detailed output.
+        max_results (int): Maximum number of papers to fetch.
 
     Returns:
         List[List[str]]: A list of papers with extracted details.
     """
-    search_params = {
-        "db": "pubmed",
-        "term": query,
-        "retmode": "json",
-        "retmax": 10  # Adjust number of papers fetched
-    }
+    return asyncio.run(_fetch_papers_async(query, debug, max_results))
 
-    paper_ids = _make_request(PUBMED_API_URL, search_params, is_json=True).get("esearchresult", {}).get("idlist", [])
+async def _fetch_papers_async(query: str, debug: bool, max_results: int) -> List[List[str]]:
+    """
+    Searches PubMed, then fetches all efetch batches concurrently.
+
+    For bulk loads, each batch is parsed and classified in a worker process as soon as
+    it arrives, so CPU-bound parsing runs in parallel and overlaps the remaining downloads.
 
-    if not paper_ids:
-        logging.warning("⚠ No papers found for the query: %s", query)
-        return []
+    Args:
+        query (str): The search term for PubMed.
+        debug (bool): If True, enables detailed output.
+        max_results (int): Maximum number of papers to fetch.
 
+    Returns:
+        List[List[str]]: A list of papers with extracted details.
+    """
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+    # One HTTP/2 client per fetch: batches are multiplexed over a single kept-alive connection
+    async with httpx.AsyncClient(http2=True, timeout=10, headers={"User-Agent": NCBI_TOOL}) as client:
+        paper_ids = await _search_ids(client, semaphore, query, max_results)
+
+        if not paper_ids:
+            logging.warning("⚠ No papers found for the query: %s", query)
+            return []
+
+        batches = [
+            paper_ids[start:start + EFETCH_BATCH_SIZE]
+            for start in range(0, len(paper_ids), EFETCH_BATCH_SIZE)
+        ]
+        parse_workers = min(len(batches), PARSE_WORKERS)
+        use_pool = len(batches) >= PARALLEL_PARSE_MIN_BATCHES and parse_workers > 1
+
+        # spawn: workers must not inherit the event loop's threads, and behave the same on every OS
+        pool = (
+            ProcessPoolExecutor(max_workers=parse_workers, mp_context=multiprocessing.get_context("spawn"))
+            if use_pool else contextlib.nullcontext()
+        )
+        with pool as executor:
+            batch_papers = await asyncio.gather(*[
+                _fetch_batch(client, semaphore, executor, batch, debug)
+                for batch in batches
+            ])
+
+    return [paper for papers in batch_papers for paper in papers]
+
+async def _fetch_batch(client: httpx.AsyncClient, semaphore: asyncio.Semaphore,
+                       executor: Optional[ProcessPoolExecutor], batch: List[str], debug: bool) -> List[List[str]]:
+    """
+    Fetches one efetch batch and parses it, in a worker process when an executor is given.
+
+    Args:
+        client (httpx.AsyncClient): Shared HTTP client.
+        semaphore (asyncio.Semaphore): Limits requests in flight.
+        executor (ProcessPoolExecutor or None): Pool used to parse the response.
+        batch (List[str]): PubMed IDs to fetch.
+        debug (bool): If True, enables detailed output.
+
+    Returns:
+        List[List[str]]: Parsed paper details for the batch.
+    """
     fetch_params = {
         "db": "pubmed",
-        "id": ",".join(paper_ids),
+        "id": ",".join(batch),
         "retmode": "xml"
     }
+    fetch_response = await _afetch(client, semaphore, PUBMED_FETCH_URL, fetch_params, is_json=False)
 
-    fetch_response = _make_request(PUBMED_FETCH_URL, fetch_params, is_json=False)
-    return parse_papers(fetch_response, debug)
+    if executor is None:
+        return parse_papers(fetch_response, debug)
 
-def _make_request(url: str, params: dict, is_json: bool = True) -> dict:
+    # Workers have no logging configured, so paper details are logged here in the parent
+    papers = await asyncio.get_running_loop().run_in_executor(executor, parse_papers, fetch_response)
+    log_level = logging.INFO if debug else logging.DEBUG
+    if logging.getLogger().isEnabledFor(log_level):
+        for paper in papers:
+            _log_paper(paper, log_level)
+    return papers
+
+async def _search_ids(client: httpx.AsyncClient, semaphore: asyncio.Semaphore, query: str, max_results: int) -> List[str]:
     """
-    Helper function to make GET requests with retries.
-    
+    Collects matching PubMed IDs, paging through esearch with retstart/retmax.
+
+    Args:
+        client (httpx.AsyncClient): Shared HTTP client.
+        semaphore (asyncio.Semaphore): Limits requests in flight.
+        query (str): The search term for PubMed.
+        max_results (int): Maximum number of IDs to collect.
+
+    Returns:
+        List[str]: PubMed IDs in relevance order.
+
+    Raises:
+        PubMedAPIError: If esearch reports an error.
+    """
+    if max_results > ESEARCH_MAX_RESULTS:
+        logging.warning("⚠ PubMed search returns at most %d records; limiting %d to %d.",
+                        ESEARCH_MAX_RESULTS, max_results, ESEARCH_MAX_RESULTS)
+        max_results = ESEARCH_MAX_RESULTS
+
+    paper_ids = []
+
+    while len(paper_ids) < max_results:
+        search_params = {
+            "db": "pubmed",
+            "term": query,
+            "retmode": "json",
+            "retstart": len(paper_ids),
+            "retmax": min(ESEARCH_PAGE_SIZE, max_results - len(paper_ids))
+        }
+
+        response = await _afetch(client, semaphore, PUBMED_API_URL, search_params, is_json=True)
+        result = response.get("esearchresult", {})
+        if "ERROR" in result:
+            raise PubMedAPIError(f"PubMed search failed: {result['ERROR']}")
+
+        id_list = result.get("idlist", [])
+        paper_ids.extend(id_list)
+
+        if not id_list or len(paper_ids) >= int(result.get("count", 0)):
+            break
+
+    return paper_ids
+
+def _request_params(params: dict) -> dict:
+    """
+    Adds the NCBI tool name, contact email and API key to query parameters.
+
     Args:
+        params (dict): Query parameters.
+
+    Returns:
+        dict: A new dict including the NCBI identification parameters.
+    """
+    params = {**params, "tool": NCBI_TOOL}
+    if NCBI_EMAIL:
+        params.setdefault("email", NCBI_EMAIL)
+    if NCBI_API_KEY:
+        params.setdefault("api_key", NCBI_API_KEY)
+    return params
+
+async def _afetch(client: httpx.AsyncClient, semaphore: asyncio.Semaphore, url: str, params: dict, is_json: bool = True):
+    """
+    Helper coroutine to make GET requests with retries.
+
+    Args:
+        client (httpx.AsyncClient): Shared HTTP client.
+        semaphore (asyncio.Semaphore): Limits requests in flight.
         url (str): The API endpoint URL.
         params (dict): Query parameters.
         is_json (bool): Whether to return JSON response.
 
     Returns:
-        dict or str: Parsed JSON response or raw XML response.
+        dict or bytes: Parsed JSON response or raw XML response.
 
     Raises:
-        PubMedAPIError: If the request fails after retries.
+        PubMedAPIError: If the request fails after retries, or with a non-retryable status.
     """
+    params = _request_params(params)
+
     for attempt in range(1, RETRIES + 1):
         try:
-            response = requests.get(url, params=params, timeout=10)
+            async with semaphore:
+                await _rate_limiter(client).wait()
+                response = await client.get(url, params=params)
             response.raise_for_status()
-            return response.json() if is_json else response.text
-        except requests.RequestException as e:
+            return orjson.loads(response.content) if is_json else response.content
+        except (httpx.HTTPError, orjson.JSONDecodeError) as e:
             logging.error("❌ API request failed (attempt %d/%d): %s", attempt, RETRIES, e)
-            if attempt == RETRIES:
-                raise PubMedAPIError(f"Failed to fetch data from PubMed after {RETRIES} attempts.") from e
+            if attempt == RETRIES or not _is_retryable(e):
+                raise PubMedAPIError(f"Failed to fetch data from PubMed after {attempt} attempts.") from e
+            await asyncio.sleep(_retry_delay(e, attempt))
 
-def parse_papers(xml_data: str, debug: bool = False) -> List[List[str]]:
+def _rate_limiter(client: httpx.AsyncClient) -> _RateLimiter:
+    """
+    Returns the rate limiter shared by every request made through a client.
+
+    Args:
+        client (httpx.AsyncClient): Shared HTTP client.
+
+    Returns:
+        _RateLimiter: The client's limiter, created on first use.
+    """
+    limiter = _RATE_LIMITERS.get(client)
+    if limiter is None:
+        limiter = _RATE_LIMITERS[client] = _RateLimiter(NCBI_REQUESTS_PER_SECOND)
+    return limiter
+
+def _is_retryable(error: Exception) -> bool:
+    """
+    Determines whether a failed request is worth retrying.
+
+    Args:
+        error (Exception): The HTTP or JSON decoding error raised by the request.
+
+    Returns:
+        bool: True for network errors, undecodable bodies and throttling or transient server responses.
+    """
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code in RETRY_STATUS_CODES
+    return isinstance(error, (httpx.TransportError, orjson.JSONDecodeError))
+
+def _retry_delay(error: Exception, attempt: int) -> float:
+    """
+    Computes the exponential backoff before the next attempt, honouring Retry-After up to RETRY_MAX_BACKOFF.
+
+    Args:
+        error (Exception): The HTTP or JSON decoding error raised by the request.
+        attempt (int): The attempt that just failed, starting at 1.
+
+    Returns:
+        float: Seconds to wait.
+    """
+    if isinstance(error, httpx.HTTPStatusError):
+        retry_after = error.response.headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            return min(float(retry_after), RETRY_MAX_BACKOFF)
+    return min(RETRY_BACKOFF_FACTOR * 2 ** (attempt - 1), RETRY_MAX_BACKOFF)
+
+def parse_papers(xml_data: Union[bytes, str], debug: bool = False) -> List[List[str]]:
     """
     Parse XML response from PubMed and extract required details.
 
     Args:
-        xml_data (str): XML response from PubMed API.
-        debug (bool): If True, prints detailed information.
+        xml_data (bytes or str): XML response from PubMed API. Raw bytes are parsed as-is,
+            letting the parser honour the encoding in the XML declaration.
+        debug (bool): If True, logs details of each paper at INFO level (DEBUG otherwise).
 
     Returns:
         List[List[str]]: List of parsed paper details.
     """
-    root = ET.fromstring(xml_data)
     papers_list = []
+    log_level = logging.INFO if debug else logging.DEBUG
+    log_details = logging.getLogger().isEnabledFor(log_level)  # Skip formatting when filtered out
+    records = _iter_records_pugi(xml_data) if pygixml is not None else _iter_records(xml_data)
 
-    for article in root.findall(".//PubmedArticle"):
-        pubmed_id = article.findtext(".//PMID", default="N/A")
-        title = article.findtext(".//ArticleTitle", default="N/A")
-        pub_date = article.findtext(".//PubDate/Year", default="N/A")
-
-        authors = article.findall(".//Author")
+    for pubmed_id, title, pub_date, authors in records:
         non_academic_authors, company_affiliations, corresponding_email = _extract_author_info(authors)
 
-        if debug:
-            logging.info(f"📄 PubMed ID: {pubmed_id}")
-            logging.info(f"📝 Title: {title}")
-            logging.info(f"📅 Publication Date: {pub_date}")
-            logging.info(f"👨‍🔬 Non-Academic Authors: {', '.join(non_academic_authors) or 'N/A'}")
-            logging.info(f"🏢 Company Affiliations: {', '.join(company_affiliations) or 'N/A'}")
-            logging.info(f"📧 Corresponding Email: {corresponding_email or 'N/A'}")
-
-        papers_list.append([
+        paper = [
             pubmed_id, title, pub_date,
-            "; ".join(non_academic_authors) if non_academic_authors else "N/A",
-            "; ".join(company_affiliations) if company_affiliations else "N/A",
+            "; ".join(non_academic_authors) or "N/A",
+            "; ".join(company_affiliations) or "N/A",
             corresponding_email
-        ])
+        ]
+        if log_details:
+            _log_paper(paper, log_level)
+
+        papers_list.append(paper)
 
     return papers_list
 
-def _extract_author_info(authors) -> Tuple[List[str], List[str], Optional[str]]:
+def _log_paper(paper: List[str], log_level: int) -> None:
+    """
+    Logs the details of one parsed paper.
+
+    Args:
+        paper (List[str]): A row returned by ``parse_papers``.
+        log_level (int): Logging level to use.
+    """
+    pubmed_id, title, pub_date, authors, affiliations, email = paper
+    logging.log(log_level, "📄 PubMed ID: %s", pubmed_id)
+    logging.log(log_level, "📝 Title: %s", title)
+    logging.log(log_level, "📅 Publication Date: %s", pub_date)
+    logging.log(log_level, "👨‍🔬 Non-Academic Authors: %s", authors)
+    logging.log(log_level, "🏢 Company Affiliations: %s", affiliations)
+    logging.log(log_level, "📧 Corresponding Email: %s", email or "N/A")
+
+def _iter_records(xml_data: Union[bytes, str]):
+    """
+    Yields the fields of each article using lxml (or the stdlib parser).
+
+    Args:
+        xml_data (bytes or str): XML response from PubMed API.
+
+    Yields:
+        Tuple[str, str, str, List[Tuple[str, str]]]: PubMed ID, title, publication year and
+        (full name, affiliation) pairs for every author.
+    """
+    encoding = None
+    if isinstance(xml_data, str):
+        # lxml rejects str input carrying an encoding declaration; re-encode and
+        # override whatever encoding the declaration names
+        xml_data = xml_data.encode("utf-8")
+        encoding = "utf-8"
+
+    for article in _iter_articles(xml_data, encoding):
+        pubmed_id, title, pub_date, authors = _extract_article_fields(article)
+        yield pubmed_id, title, pub_date, [
+            (
+                f"{author.findtext('LastName', default='')} {author.findtext('Initials', default='')}".strip(),
+                _first_text(_AFFILIATION_XP(author), default="")
+            )
+            for author in authors
+        ]
+
+def _iter_records_pugi(xml_data: Union[bytes, str]):
+    """
+    Yields the fields of each article using the pugixml backend.
+
+    Args:
+        xml_data (bytes or str): XML response from PubMed API.
+
+    Yields:
+        Tuple[str, str, str, List[Tuple[str, str]]]: PubMed ID, title, publication year and
+        (full name, affiliation) pairs for every author.
+    """
+    if isinstance(xml_data, bytes):
+        # pygixml only parses str; decode using the XML declaration (PubMed sends UTF-8)
+        declared = _XML_ENCODING_RE.match(xml_data)
+        xml_data = xml_data.decode(declared.group(1).decode("ascii") if declared else "utf-8")
+
+    document = pygixml.parse_string(xml_data)
+
+    for match in _PUGI_ARTICLE_XQ.evaluate_node_set(document.root):
+        article = match.node
+        authors = []
+        for author_match in _PUGI_AUTHOR_XQ.evaluate_node_set(article):
+            author = author_match.node
+            last_name = author.child_value("LastName") or ""
+            initials = author.child_value("Initials") or ""
+            authors.append((
+                f"{last_name} {initials}".strip(),
+                _pugi_text(_PUGI_AFFILIATION_XQ.evaluate_node(author), default="")
+            ))
+
+        yield (
+            _pugi_text(_PUGI_PMID_XQ.evaluate_node(article)),
+            _pugi_text(_PUGI_TITLE_XQ.evaluate_node(article)),
+            _pugi_text(_PUGI_YEAR_XQ.evaluate_node(article)),
+            authors
+        )
+
+def _pugi_text(match, default: str = "N/A") -> str:
+    """
+    Returns the text of a pugixml XPath match, mirroring ``_first_text``.
+
+    Args:
+        match (pygixml.XPathNode): Result of ``XPathQuery.evaluate_node``; null when nothing matched.
+        default (str): Value returned when nothing matched.
+
+    Returns:
+        str: The element text, an empty string if it has none, or ``default``.
+    """
+    if match is None or match.node.is_null():
+        return default
+    return match.node.child_value() or ""
+
+def _iter_articles(xml_data: bytes, encoding: Optional[str] = None):
+    """
+    Streams PubmedArticle elements, discarding each one once it has been processed.
+
+    Args:
+        xml_data (bytes): XML response from PubMed API.
+        encoding (str, optional): Encoding overriding the XML declaration.
+
+    Yields:
+        ET.Element: One fully parsed PubmedArticle element at a time.
+    """
+    source = io.BytesIO(xml_data)
+
+    if _HAS_LXML:
+        for _, article in ET.iterparse(source, tag="PubmedArticle", huge_tree=False, encoding=encoding):
+            yield article
+            article.clear(keep_tail=False)
+            while article.getprevious() is not None:
+                del article.getparent()[0]
+    else:
+        for _, element in ET.iterparse(source, parser=ET.XMLParser(encoding=encoding)):
+            if element.tag == "PubmedArticle":
+                yield element
+                element.clear()
+
+def _extract_article_fields(article) -> Tuple[str, str, str, list]:
+    """
+    Collects the PubMed ID, title, publication year and authors in one walk of the article.
+
+    Args:
+        article (ET.Element): A PubmedArticle element.
+
+    Returns:
+        Tuple[str, str, str, list]: PubMed ID, title, publication year and author elements.
+        Missing fields default to "N/A", as ``findtext`` on the first match would.
+    """
+    pubmed_id = title = pub_date = None
+    authors = []
+
+    # lxml filters tags in C; the stdlib iterator has to visit every element
+    elements = article.iter(*_ARTICLE_FIELD_TAGS) if _HAS_LXML else article.iter()
+
+    for element in elements:
+        tag = element.tag
+        if tag == "Author":
+            authors.append(element)
+        elif tag == "PMID":
+            if pubmed_id is None:
+                pubmed_id = element.text or ""
+        elif tag == "ArticleTitle":
+            if title is None:
+                title = element.text or ""
+        elif tag == "PubDate":
+            if pub_date is None:
+                pub_date = element.findtext("Year")
+
+    return (
+        "N/A" if pubmed_id is None else pubmed_id,
+        "N/A" if title is None else title,
+        "N/A" if pub_date is None else pub_date,
+        authors
+    )
+
+def _first_text(elements, default: str = "N/A") -> str:
+    """
+    Returns the text of the first matched element, mirroring ``findtext``.
+
+    Args:
+        elements (List[ET.Element]): Elements returned by an XPath query.
+        default (str): Value returned when nothing matched.
+
+    Returns:
+        str: The element text, an empty string if it has none, or ``default``.
+    """
+    if not elements:
+        return default
+    return elements[0].text or ""
+
+def _extract_author_info(authors: List[Tuple[str, str]]) -> Tuple[List[str], List[str], Optional[str]]:
     """
     Extracts author details such as name, affiliations, and emails.
 
     Args:
-        authors (List[ET.Element]): List of author XML elements.
+        authors (List[Tuple[str, str]]): (full name, affiliation) pairs for each author.
 
     Returns:
         Tuple[List[str], List[str], Optional[str]]: Non-academic authors, company affiliations, corresponding email.
@@ -146,21 +584,18 @@ def _extract_author_info(authors) -> Tuple[List[str], List[str], Optional[str]]:
     company_affiliations = []
     corresponding_email = None
 
-    for author in authors:
-        last_name = author.findtext("LastName", default="")
-        initials = author.findtext("Initials", default="")
-        full_name = f"{last_name} {initials}".strip()
+    for full_name, affiliation in authors:
+        if not affiliation:
+            continue  # Nothing to classify or search for an email
 
-        affiliation_element = author.find(".//AffiliationInfo/Affiliation")
-        affiliation = affiliation_element.text if affiliation_element is not None else ""
+        non_academic, email = _scan_affiliation(affiliation)
 
-        if is_non_academic(affiliation):
+        if non_academic:
             non_academic_authors.append(full_name)
             company_affiliations.append(affiliation)
 
-        email_match = re.search(r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]+", affiliation)
-        if email_match and not corresponding_email:
-            corresponding_email = email_match.group()
+        if email and not corresponding_email:
+            corresponding_email = email
 
     return non_academic_authors, company_affiliations, corresponding_email
 
@@ -174,15 +609,40 @@ def is_non_academic(affiliation: str) -> bool:
     Returns:
         bool: True if non-academic, False otherwise.
     """
-    affiliation_lower = affiliation.lower()
+    if not affiliation:
+        return False
+
+    return _scan_affiliation(affiliation, find_email=False)[0]
+
+@functools.lru_cache(maxsize=4096)  # Co-authors often share the exact same affiliation text
+def _scan_affiliation(affiliation: str, find_email: bool = True) -> Tuple[bool, Optional[str]]:
+    """
+    Classifies an affiliation and extracts its first email address in a single pass.
+
+    Args:
+        affiliation (str): The affiliation text.
+        find_email (bool): Whether to keep scanning for an email once the affiliation is academic.
+
+    Returns:
+        Tuple[bool, Optional[str]]: Whether the affiliation is non-academic, and the email found.
+    """
+    academic = False
+    non_academic = False
+    email = None
+    find_email = find_email and "@" in affiliation  # No "@" means no email to wait for
 
-    if any(keyword in affiliation_lower for keyword in ACADEMIC_KEYWORDS):
-        return False  # Academic institution
+    for match in _AFFILIATION_RE.finditer(affiliation):
+        if match.group("email"):
+            email = email or match.group("email")
+        elif match.group("acad"):
+            academic = True  # Academic keywords take precedence
+        else:
+            non_academic = True
 
-    if any(keyword in affiliation_lower for keyword in NON_ACADEMIC_KEYWORDS):
-        return True  # Non-academic institution
+        if academic and (email or not find_email):
+            break  # Classification can no longer change
 
-    return False  # Default assumption: academic
+    return non_academic and not academic, email
 
 def save_to_csv(papers: List[List[str]], filename: str) -> None:
     """
@@ -194,15 +654,17 @@ def save_to_csv(papers: List[List[str]], filename: str) -> None:
     """
     output_path = os.path.join(DATA_DIR, filename)
 
-    with open(output_path, mode="w", newline="", encoding="utf-8") as file:
+    with open(output_path, mode="w", newline="", encoding="utf-8", buffering=CSV_BUFFER_SIZE) as file:
         writer = csv.writer(file)
         writer.writerow(["PubmedID", "Title", "Publication Date", "Non-academic Author(s)", "Company Affiliation(s)", "Corresponding Email"])
-        writer.writerows(papers)
+        for start in range(0, len(papers), CSV_BATCH_SIZE):
+            writer.writerows(papers[start:start + CSV_BATCH_SIZE])
 
-    logging.info(f"✅ Papers saved to {output_path}")
+    logging.info("✅ Papers saved to %s", output_path)
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
     query = "biotecnology"  # Change this to your desired search term
     papers = fetch_papers(query, debug=True)  
 
@@ -1,7 +1,15 @@
 import unittest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
+import asyncio
+import logging
+import os
+import subprocess
+import sys
+import time
+import httpx
 import pytest
 import pubmedpaperfetcher.papers_fetcher as papers_fetcher
+from pubmedpaperfetcher.get_papers_list import configure_logging
 
 
 # Sample XML responses for testing
@@ -137,6 +145,31 @@ def test_parse_papers():
     assert papers[0][4].startswith("XYZ Biotech Ltd")  # Company Affiliation
     assert papers[0][5] == "example@biotech.com"  # Email
 
+def test_parse_papers_debug_logging(caplog):
+    """Test that paper details are logged only when requested or at DEBUG level"""
+    with caplog.at_level("INFO"):
+        papers_fetcher.parse_papers(test_xml_response)
+        assert "PubMed ID" not in caplog.text
+
+        papers_fetcher.parse_papers(test_xml_response, debug=True)
+        assert "📄 PubMed ID: 123456" in caplog.text
+
+def test_parse_bytes_response():
+    """Test parsing raw response bytes using the encoding from the XML declaration"""
+    latin1_xml = test_xml_response.replace("UTF-8", "ISO-8859-1").replace("Doe", "Döe")
+    papers = papers_fetcher.parse_papers(latin1_xml.encode("iso-8859-1"))
+
+    assert papers[0][3] == "Döe J"
+
+def test_parse_str_response_ignores_declared_encoding():
+    """Test that decoded str input is parsed as-is, whatever encoding the declaration names"""
+    latin1_xml = test_xml_response.replace("UTF-8", "ISO-8859-1").replace("Doe", "Döe")
+
+    with patch.object(papers_fetcher, "pygixml", None):
+        papers = papers_fetcher.parse_papers(latin1_xml)
+
+    assert papers[0][3] == "Döe J"
+
 def test_parse_empty_response():
     """Test parsing an empty XML response"""
     papers = papers_fetcher.parse_papers(empty_xml_response, debug=True)
@@ -151,12 +184,66 @@ def test_parse_multiple_non_academic_authors():
     assert "Big Pharma Inc." in papers[0][4]  # Check company affiliation
     assert "BioTech Solutions" in papers[0][4]
 
+def test_parse_multiple_articles():
+    """Test that every streamed article is parsed in document order"""
+    combined = (
+        test_xml_response.replace("</PubmedArticleSet>", "")
+        + xml_no_non_academic.split("<PubmedArticleSet>", 1)[1]
+    )
+    papers = papers_fetcher.parse_papers(combined)
+
+    assert [paper[0] for paper in papers] == ["123456", "789012"]
+    assert papers[1][3] == "N/A"
+
+def test_parse_missing_fields():
+    """Test parsing an article whose fields are present but empty"""
+    papers = papers_fetcher.parse_papers(xml_missing_fields)
+
+    assert len(papers) == 1
+    assert papers[0][:3] == ["", "", ""]  # Empty PMID, title and year
+    assert papers[0][3] == "N/A"  # No non-academic authors
+    assert papers[0][5] is None  # No email
+
+def test_save_to_csv(tmp_path):
+    """Test that all rows are written across write batches"""
+    papers = [[str(i), "Title", "2023", "N/A", "N/A", None] for i in range(5)]
+
+    with patch.object(papers_fetcher, "DATA_DIR", str(tmp_path)), \
+            patch.object(papers_fetcher, "CSV_BATCH_SIZE", 2):
+        papers_fetcher.save_to_csv(papers, "out.csv")
+
+    lines = (tmp_path / "out.csv").read_text(encoding="utf-8").splitlines()
+    assert lines[0].startswith("PubmedID,Title")
+    assert [line.split(",")[0] for line in lines[1:]] == ["0", "1", "2", "3", "4"]
+
+def test_parse_absent_fields():
+    """Test that absent fields default to N/A and only the first PMID is used"""
+    xml = b"""<PubmedArticleSet><PubmedArticle><MedlineCitation>
+        <PMID>111</PMID>
+        <PubDate><MedlineDate>2020 Spring</MedlineDate></PubDate>
+        <CommentsCorrections><PMID>222</PMID></CommentsCorrections>
+    </MedlineCitation></PubmedArticle></PubmedArticleSet>"""
+    papers = papers_fetcher.parse_papers(xml)
+
+    assert papers[0][:4] == ["111", "N/A", "N/A", "N/A"]
+
+@pytest.mark.parametrize("xml", [test_xml_response, xml_missing_fields, xml_multiple_non_academic, empty_xml_response])
+def test_parser_backends_agree(xml):
+    """Test that the pugixml backend matches the lxml backend"""
+    pytest.importorskip("pygixml")
+
+    expected = papers_fetcher.parse_papers(xml)
+    with patch.object(papers_fetcher, "pygixml", None):
+        assert papers_fetcher.parse_papers(xml) == expected
+    assert papers_fetcher.parse_papers(xml.encode("utf-8")) == expected
+
 def test_is_non_academic():
     """Test the affiliation classification function"""
     assert papers_fetcher.is_non_academic("XYZ Biotech Ltd") is True
     assert papers_fetcher.is_non_academic("Harvard University") is False
     assert papers_fetcher.is_non_academic("National Laboratory") is False
     assert papers_fetcher.is_non_academic("Pharma Research Inc.") is True
+    assert papers_fetcher.is_non_academic("") is False
 
 
 def test_is_non_academic_variations():
@@ -167,6 +254,236 @@ def test_is_non_academic_variations():
     assert papers_fetcher.is_non_academic("MIT Research Labs") is False
     assert papers_fetcher.is_non_academic("Global Pharmaceuticals") is True
 
+def test_scan_affiliation():
+    """Test single-pass classification and email extraction"""
+    assert papers_fetcher._scan_affiliation("XYZ Biotech Ltd, example@biotech.com") == (True, "example@biotech.com")
+    assert papers_fetcher._scan_affiliation("Pharma Dept., jo@university.edu") == (False, "jo@university.edu")
+    assert papers_fetcher._scan_affiliation("lab.head@pharma.com") == (False, "lab.head@pharma.com")
+    assert papers_fetcher._scan_affiliation("Independent Consultant") == (False, None)
+
+def test_scan_affiliation_non_ascii():
+    """Test that non-ASCII letters are not folded into ASCII email or keyword matches"""
+    assert papers_fetcher._scan_affiliation("Acme Pharma, ali@acme.comıstanbul") == (True, "ali@acme.com")
+    assert papers_fetcher._scan_affiliation("Kerem ſ.a., bob@x.orgſ") == (False, "bob@x.org")
+
+def test_scan_affiliation_is_cached():
+    """Test that repeated affiliations are classified once"""
+    papers_fetcher._scan_affiliation.cache_clear()
+    papers_fetcher.parse_papers(xml_multiple_non_academic.replace("BioTech Solutions", "Big Pharma Inc."))
+
+    info = papers_fetcher._scan_affiliation.cache_info()
+    assert (info.misses, info.hits) == (1, 1)
+
+def test_fetch_papers_pages_and_batches():
+    """Test esearch pagination and concurrent efetch batching"""
+    search_pages = [
+        {"esearchresult": {"count": "250", "idlist": [str(i) for i in range(150)]}},
+        {"esearchresult": {"count": "250", "idlist": [str(i) for i in range(150, 250)]}},
+    ]
+
+    async def fake_afetch(client, semaphore, url, params, is_json=True):
+        if is_json:
+            return search_pages.pop(0)
+        return empty_xml_response
+
+    with patch.object(papers_fetcher, "ESEARCH_PAGE_SIZE", 150), \
+            patch.object(papers_fetcher, "_afetch", side_effect=fake_afetch) as mock_afetch:
+        papers_fetcher.fetch_papers("cancer", max_results=1000)
+
+    search_calls = [c for c in mock_afetch.call_args_list if c.kwargs["is_json"]]
+    fetch_calls = [c for c in mock_afetch.call_args_list if not c.kwargs["is_json"]]
+    assert [c.args[3]["retstart"] for c in search_calls] == [0, 150]
+    assert [len(c.args[3]["id"].split(",")) for c in fetch_calls] == [200, 50]
+
+def test_fetch_papers_parses_batches_in_processes(caplog):
+    """Test that bulk loads are parsed in a spawned process pool, keep their order and still log details"""
+    search_page = {"esearchresult": {"count": "4", "idlist": ["1", "2", "3", "4"]}}
+
+    async def fake_afetch(client, semaphore, url, params, is_json=True):
+        if is_json:
+            return search_page
+        return test_xml_response.replace("123456", params["id"]).encode("utf-8")
+
+    with patch.object(papers_fetcher, "EFETCH_BATCH_SIZE", 1), \
+            patch.object(papers_fetcher, "PARALLEL_PARSE_MIN_BATCHES", 2), \
+            patch.object(papers_fetcher, "PARSE_WORKERS", 2), \
+            patch.object(papers_fetcher, "ProcessPoolExecutor", wraps=papers_fetcher.ProcessPoolExecutor) as mock_pool, \
+            patch.object(papers_fetcher, "_afetch", side_effect=fake_afetch), \
+            caplog.at_level("INFO"):
+        papers = papers_fetcher.fetch_papers("cancer", debug=True, max_results=4)
+
+    assert mock_pool.call_args.kwargs["max_workers"] == 2
+    assert mock_pool.call_args.kwargs["mp_context"].get_start_method() == "spawn"
+    assert caplog.text.count("📄 PubMed ID:") == 4
+    assert [paper[0] for paper in papers] == ["1", "2", "3", "4"]
+    assert all(paper[5] == "example@biotech.com" for paper in papers)
+
+def test_afetch_decodes_json():
+    """Test that esearch JSON is decoded from the raw response body"""
+    def handler(request):
+        return httpx.Response(200, content=b'{"esearchresult": {"idlist": ["42"]}}')
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await papers_fetcher._afetch(client, asyncio.Semaphore(1), papers_fetcher.PUBMED_API_URL, {})
+
+    assert asyncio.run(run()) == {"esearchresult": {"idlist": ["42"]}}
+
+def test_search_ids_clamps_to_esearch_cap(caplog):
+    """Test that requests past the esearch cap are clamped with a warning"""
+    async def fake_afetch(client, semaphore, url, params, is_json=True):
+        return {"esearchresult": {"count": "50000", "idlist": ["1"] * params["retmax"]}}
+
+    with patch.object(papers_fetcher, "_afetch", side_effect=fake_afetch) as mock_afetch:
+        ids = asyncio.run(papers_fetcher._search_ids(None, None, "cancer", 20000))
+
+    assert len(ids) == papers_fetcher.ESEARCH_MAX_RESULTS
+    assert mock_afetch.call_count == 2
+    assert "at most 9999 records" in caplog.text
+
+def test_search_ids_surfaces_esearch_error():
+    """Test that an esearch ERROR field raises PubMedAPIError"""
+    async def fake_afetch(client, semaphore, url, params, is_json=True):
+        return {"esearchresult": {"ERROR": "Search Backend failed"}}
+
+    with patch.object(papers_fetcher, "_afetch", side_effect=fake_afetch), \
+            pytest.raises(papers_fetcher.PubMedAPIError, match="Search Backend failed"):
+        asyncio.run(papers_fetcher._search_ids(None, None, "cancer", 10))
+
+def test_afetch_wraps_invalid_json():
+    """Test that an undecodable esearch body is retried and raised as PubMedAPIError"""
+    attempts = []
+
+    def handler(request):
+        attempts.append(request)
+        return httpx.Response(200, content=b"<html>Service unavailable</html>")
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            await papers_fetcher._afetch(client, asyncio.Semaphore(1), papers_fetcher.PUBMED_API_URL, {})
+
+    with patch.object(papers_fetcher, "RETRY_BACKOFF_FACTOR", 0), \
+            pytest.raises(papers_fetcher.PubMedAPIError):
+        asyncio.run(run())
+    assert len(attempts) == papers_fetcher.RETRIES
+
+@pytest.fixture
+def cli_logging():
+    """Applies the CLI logging configuration without leaking a root handler or logger levels into other tests"""
+    loggers = [logging.getLogger(name) for name in ("httpx", "httpcore")]
+    levels = [logger.level for logger in loggers]
+    with patch.object(logging, "basicConfig"):
+        configure_logging()
+    yield
+    for logger, level in zip(loggers, levels):
+        logger.setLevel(level)
+
+def test_api_key_not_logged(caplog, cli_logging):
+    """Test that request logging under the CLI configuration never exposes the API key"""
+
+    def handler(request):
+        return httpx.Response(200, content=b"{}")
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            await papers_fetcher._afetch(client, asyncio.Semaphore(1), papers_fetcher.PUBMED_API_URL, {})
+
+    with caplog.at_level("INFO"), patch.object(papers_fetcher, "NCBI_API_KEY", "SECRET123"):
+        asyncio.run(run())
+
+    assert "SECRET123" not in caplog.text
+
+def test_import_does_not_configure_logging():
+    """Test that importing the package leaves the root logger untouched"""
+    code = (
+        "import logging, pubmedpaperfetcher.papers_fetcher; "
+        "root = logging.getLogger(); "
+        "assert not root.handlers and root.level == logging.WARNING"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=os.path.dirname(os.path.dirname(__file__)))
+
+def test_request_params_adds_api_key():
+    """Test that the NCBI API key and tool name are sent with every request"""
+    with patch.object(papers_fetcher, "NCBI_API_KEY", "secret"):
+        sent = papers_fetcher._request_params({"db": "pubmed"})
+
+    assert sent["api_key"] == "secret"
+    assert sent["tool"] == papers_fetcher.NCBI_TOOL
+    assert sent["db"] == "pubmed"
+
+def test_afetch_raises_after_retries():
+    """Test that persistent HTTP errors surface as PubMedAPIError"""
+    attempts = []
+
+    def handler(request):
+        attempts.append(request)
+        return httpx.Response(500)
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            await papers_fetcher._afetch(client, asyncio.Semaphore(1), papers_fetcher.PUBMED_API_URL, {})
+
+    with patch.object(papers_fetcher, "RETRY_BACKOFF_FACTOR", 0), \
+            pytest.raises(papers_fetcher.PubMedAPIError):
+        asyncio.run(run())
+    assert len(attempts) == papers_fetcher.RETRIES
+
+def test_afetch_backoff_and_status_handling():
+    """Test Retry-After, exponential backoff and non-retryable statuses"""
+    responses = [
+        httpx.Response(429, headers={"Retry-After": "2"}),
+        httpx.Response(503),
+        httpx.Response(200, content=b"<PubmedArticleSet/>"),
+        httpx.Response(404),
+    ]
+
+    async def run():
+        transport = httpx.MockTransport(lambda request: responses.pop(0))
+        async with httpx.AsyncClient(transport=transport) as client:
+            semaphore = asyncio.Semaphore(1)
+            body = await papers_fetcher._afetch(client, semaphore, papers_fetcher.PUBMED_FETCH_URL, {}, is_json=False)
+            with pytest.raises(papers_fetcher.PubMedAPIError):
+                await papers_fetcher._afetch(client, semaphore, papers_fetcher.PUBMED_FETCH_URL, {}, is_json=False)
+            return body
+
+    with patch.object(papers_fetcher, "NCBI_REQUESTS_PER_SECOND", float("inf")), \
+            patch.object(papers_fetcher.asyncio, "sleep", new=AsyncMock()) as mock_sleep:
+        assert asyncio.run(run()) == b"<PubmedArticleSet/>"
+
+    assert [c.args[0] for c in mock_sleep.call_args_list] == [2.0, papers_fetcher.RETRY_BACKOFF_FACTOR * 2]
+    assert responses == []
+
+def test_retry_delay_caps_retry_after():
+    """Test that a huge Retry-After is capped at RETRY_MAX_BACKOFF"""
+    response = httpx.Response(429, headers={"Retry-After": "86400"}, request=httpx.Request("GET", papers_fetcher.PUBMED_API_URL))
+    error = httpx.HTTPStatusError("Too Many Requests", request=response.request, response=response)
+
+    assert papers_fetcher._retry_delay(error, 1) == papers_fetcher.RETRY_MAX_BACKOFF
+
+def test_afetch_spaces_request_starts():
+    """Test that concurrent requests through one client start at most NCBI_REQUESTS_PER_SECOND apart"""
+    starts = []
+
+    def handler(request):
+        starts.append(time.monotonic())
+        return httpx.Response(200, content=b"{}")
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            semaphore = asyncio.Semaphore(5)
+            # Warm the client up first, so its one-off setup cost does not skew the measured gaps
+            await papers_fetcher._afetch(client, semaphore, papers_fetcher.PUBMED_API_URL, {})
+            await asyncio.gather(*[
+                papers_fetcher._afetch(client, semaphore, papers_fetcher.PUBMED_API_URL, {}) for _ in range(4)
+            ])
+
+    with patch.object(papers_fetcher, "NCBI_REQUESTS_PER_SECOND", 20):
+        asyncio.run(run())
+
+    gathered = starts[1:]
+    assert len(gathered) == 4
+    assert all(later - earlier >= 0.05 - 5e-3 for earlier, later in zip(gathered, gathered[1:]))
+
 
 if __name__ == "__main__":
     pytest.main()